@@ -20,8 +20,8 @@ CREATE TABLE IF NOT EXISTS races (
     updated_at TIMESTAMP DEFAULT NOW()
 );
 
-CREATE INDEX IF NOT EXISTS idx_races_race_date ON races(race_date);
 CREATE INDEX IF NOT EXISTS idx_races_racecourse ON races(racecourse);
+-- Also serves race_date-only lookups as a prefix index
 CREATE INDEX IF NOT EXISTS idx_races_date_course ON races(race_date, racecourse);
 
 -- Horses table
@@ -50,7 +50,20 @@ CREATE TABLE IF NOT EXISTS horses (
     import_date TEXT,
     created_at TIMESTAMP DEFAULT NOW(),
     updated_at TIMESTAMP DEFAULT NOW()
-);
+) WITH (fillfactor = 90);
+
+-- Profiles are re-upserted every time a horse runs; keep room for HOT updates.
+-- Tables created before this setting get it once; the ALTER is skipped when
+-- it is already set, so re-running the schema takes no table lock.
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_class
+        WHERE oid = 'horses'::regclass AND 'fillfactor=90' = ANY(reloptions)
+    ) THEN
+        ALTER TABLE horses SET (fillfactor = 90);
+    END IF;
+END $$;
 
 CREATE INDEX IF NOT EXISTS idx_horses_name ON horses(name);
 CREATE INDEX IF NOT EXISTS idx_horses_trainer ON horses(trainer);
@@ -88,8 +101,10 @@ CREATE TABLE IF NOT EXISTS trainers (
 CREATE INDEX IF NOT EXISTS idx_trainers_name ON trainers(name);
 
 -- Performance table
+-- Child tables use BIGSERIAL: every ON CONFLICT upsert consumes a sequence
+-- value even when it updates, so re-scrapes burn through ids quickly.
 CREATE TABLE IF NOT EXISTS performance (
-    id SERIAL PRIMARY KEY,
+    id BIGSERIAL PRIMARY KEY,
     race_id TEXT NOT NULL REFERENCES races(race_id) ON DELETE CASCADE,
     horse_id TEXT REFERENCES horses(horse_id) ON DELETE SET NULL,
     jockey_id TEXT REFERENCES jockeys(jockey_id) ON DELETE SET NULL,
@@ -109,17 +124,30 @@ CREATE TABLE IF NOT EXISTS performance (
     gear TEXT,
     created_at TIMESTAMP DEFAULT NOW(),
     UNIQUE(race_id, horse_no)
-);
+) WITH (fillfactor = 90);
+
+-- Rows are updated right after insert (gear from horse profiles); leave
+-- page headroom so those updates stay HOT. Existing tables are altered once.
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_class
+        WHERE oid = 'performance'::regclass AND 'fillfactor=90' = ANY(reloptions)
+    ) THEN
+        ALTER TABLE performance SET (fillfactor = 90);
+    END IF;
+END $$;
 
-CREATE INDEX IF NOT EXISTS idx_performance_race_id ON performance(race_id);
 CREATE INDEX IF NOT EXISTS idx_performance_horse_id ON performance(horse_id);
 CREATE INDEX IF NOT EXISTS idx_performance_jockey_id ON performance(jockey_id);
 CREATE INDEX IF NOT EXISTS idx_performance_trainer_id ON performance(trainer_id);
 CREATE INDEX IF NOT EXISTS idx_performance_position ON performance(position);
+-- Gear updates match on (race_id, horse_id) since horse_no is unknown there
+CREATE INDEX IF NOT EXISTS idx_performance_race_horse ON performance(race_id, horse_id);
 
 -- Dividends table
 CREATE TABLE IF NOT EXISTS dividends (
-    id SERIAL PRIMARY KEY,
+    id BIGSERIAL PRIMARY KEY,
     race_id TEXT NOT NULL REFERENCES races(race_id) ON DELETE CASCADE,
     pool TEXT NOT NULL,
     winning_combination TEXT,
@@ -128,11 +156,10 @@ CREATE TABLE IF NOT EXISTS dividends (
     UNIQUE(race_id, pool)
 );
 
-CREATE INDEX IF NOT EXISTS idx_dividends_race_id ON dividends(race_id);
 
 -- Incidents table
 CREATE TABLE IF NOT EXISTS incidents (
-    id SERIAL PRIMARY KEY,
+    id BIGSERIAL PRIMARY KEY,
     race_id TEXT NOT NULL REFERENCES races(race_id) ON DELETE CASCADE,
     position TEXT,
     horse_no TEXT NOT NULL,
@@ -146,7 +173,7 @@ CREATE INDEX IF NOT EXISTS idx_incidents_horse_no ON incidents(horse_no);
 
 -- Sectional times table
 CREATE TABLE IF NOT EXISTS sectional_times (
-    id SERIAL PRIMARY KEY,
+    id BIGSERIAL PRIMARY KEY,
     race_id TEXT NOT NULL REFERENCES races(race_id) ON DELETE CASCADE,
     horse_no TEXT NOT NULL,
     section_number INTEGER NOT NULL,
@@ -157,6 +184,13 @@ CREATE TABLE IF NOT EXISTS sectional_times (
     UNIQUE(race_id, horse_no, section_number)
 );
 
-CREATE INDEX IF NOT EXISTS idx_sectional_times_race_id ON sectional_times(race_id);
 CREATE INDEX IF NOT EXISTS idx_sectional_times_horse_no ON sectional_times(horse_no);
-CREATE INDEX IF NOT EXISTS idx_sectional_times_race_horse ON sectional_times(race_id, horse_no);
+
+-- Single-column race_id / race_date indexes duplicated the leading column of
+-- the UNIQUE constraints and composite indexes above; drop them from
+-- databases created before they were removed.
+DROP INDEX IF EXISTS idx_races_race_date;
+DROP INDEX IF EXISTS idx_performance_race_id;
+DROP INDEX IF EXISTS idx_dividends_race_id;
+DROP INDEX IF EXISTS idx_sectional_times_race_id;
+DROP INDEX IF EXISTS idx_sectional_times_race_horse;
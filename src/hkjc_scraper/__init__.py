@@ -2,6 +2,8 @@
 
 # Database (PostgreSQL)
 from hkjc_scraper.database import (
+    TABLE_IMPORTERS,
+    TABLE_ORDER,
     create_database,
     export_json_to_db,
     get_database_url,
@@ -26,6 +28,8 @@ from hkjc_scraper.data_parsers import (
     parse_running_position,
     generate_race_id,
     parse_sectional_time_cell,
+    RACECOURSE_MAP,
+    RACECOURSE_NAMES,
 )
 
 # ID extraction utilities
@@ -52,6 +56,8 @@ from hkjc_scraper.jockey_trainer_parsers import (
 
 __all__ = [
     # Database (PostgreSQL)
+    "TABLE_IMPORTERS",
+    "TABLE_ORDER",
     "create_database",
     "export_json_to_db",
     "get_database_url",
@@ -1,6 +1,7 @@
 """Cache operations for discovered race dates."""
 
 import json
+import os
 from pathlib import Path
 from datetime import datetime
 from typing import Any
@@ -25,6 +26,10 @@ class DiscoveryCache:
             "season_breaks": [],
             "last_updated": None,
         }
+        # (date, racecourse) -> entry in data["discovered"], for O(1) lookups
+        self._index: dict[tuple[str, str], dict] = {}
+        # (date, racecourse) pairs checked and found to have no races
+        self._no_races: set[tuple[str, str]] = set()
 
     def load(self) -> bool:
         """Load cache from disk.
@@ -38,36 +43,72 @@ class DiscoveryCache:
         try:
             content = self.cache_path.read_text(encoding="utf-8")
             self.data = json.loads(content)
+            self._index = {
+                (entry["date"], entry["racecourse"]): entry
+                for entry in self.data.get("discovered", [])
+            }
+            self._no_races = {
+                (entry["date"], entry["racecourse"])
+                for entry in self.data.get("no_races", [])
+            }
             return True
         except (json.JSONDecodeError, IOError):
             return False
 
     def save(self) -> None:
-        """Save cache to disk."""
+        """Save cache to disk.
+
+        Writes to a temporary file and renames it over the cache, so a crash
+        mid-save leaves the previous cache intact instead of a truncated file
+        that load() would discard.
+        """
         self.data["last_updated"] = datetime.now().isoformat()
         content = json.dumps(self.data, indent=2, ensure_ascii=False)
-        self.cache_path.write_text(content, encoding="utf-8")
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.cache_path)
 
     def add_discovery(self, date: str, racecourse: str, race_count: int) -> None:
         """Add a discovered race date to the cache.
 
+        An existing entry is updated in place and any no-races mark for the
+        same date + racecourse is dropped, so a refreshed check replaces
+        what was stored.
+
         Args:
             date: Race date in YYYY/MM/DD format
             racecourse: Racecourse code (ST or HV)
             race_count: Number of races found
         """
+        key = (date, racecourse)
+        self._forget_no_races(key)
+
+        if key in self._index:
+            self._index[key]["race_count"] = race_count
+            return
+
         entry = {
             "date": date,
             "racecourse": racecourse,
             "race_count": race_count
         }
+        self.data["discovered"].append(entry)
+        self._index[key] = entry
 
-        # Check if already exists
-        for existing in self.data["discovered"]:
-            if existing["date"] == date and existing["racecourse"] == racecourse:
-                return  # Already cached
+    def get_entry(self, date: str, racecourse: str) -> dict | None:
+        """Get the cached entry for a date + racecourse.
 
-        self.data["discovered"].append(entry)
+        Args:
+            date: Race date in YYYY/MM/DD format
+            racecourse: Racecourse code (ST or HV)
+
+        Returns:
+            Cached entry dict, or None if not cached
+        """
+        return self._index.get((date, racecourse))
 
     def is_cached(self, date: str, racecourse: str) -> bool:
         """Check if a date + racecourse is already cached.
@@ -79,10 +120,49 @@ class DiscoveryCache:
         Returns:
             True if cached, False otherwise
         """
-        for entry in self.data["discovered"]:
-            if entry["date"] == date and entry["racecourse"] == racecourse:
-                return True
-        return False
+        return self.get_entry(date, racecourse) is not None
+
+    def mark_no_races(self, date: str, racecourse: str) -> None:
+        """Record that a date + racecourse was checked and has no races.
+
+        Any discovered entry for the same date + racecourse is removed.
+
+        Args:
+            date: Race date in YYYY/MM/DD format
+            racecourse: Racecourse code (ST or HV)
+        """
+        key = (date, racecourse)
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            self.data["discovered"].remove(entry)
+        if key in self._no_races:
+            return
+        self._no_races.add(key)
+        self.data.setdefault("no_races", []).append(
+            {"date": date, "racecourse": racecourse}
+        )
+
+    def _forget_no_races(self, key: tuple[str, str]) -> None:
+        """Drop a no-races mark, if present."""
+        if key not in self._no_races:
+            return
+        self._no_races.discard(key)
+        self.data["no_races"] = [
+            entry for entry in self.data.get("no_races", [])
+            if (entry["date"], entry["racecourse"]) != key
+        ]
+
+    def has_no_races(self, date: str, racecourse: str) -> bool:
+        """Check if a date + racecourse is known to have no races.
+
+        Args:
+            date: Race date in YYYY/MM/DD format
+            racecourse: Racecourse code (ST or HV)
+
+        Returns:
+            True if previously checked and found empty, False otherwise
+        """
+        return (date, racecourse) in self._no_races
 
     def get_discovered(self) -> list[dict]:
         """Get all discovered race dates.
@@ -3,25 +3,20 @@ import argparse
 import asyncio
 import json
 import os
-from datetime import datetime
+from datetime import date
 from pathlib import Path
 import sys
 
-from hkjc_scraper.spider import HKJCRacingSpider
+import psycopg2
+
 from hkjc_scraper.database import (
+    TABLE_IMPORTERS,
+    TABLE_ORDER,
     create_database,
     export_json_to_db,
     get_db_connection,
-    import_dividends,
-    import_horses,
-    import_incidents,
-    import_jockeys,
-    import_performance,
-    import_races,
-    import_sectional_times,
-    import_trainers,
-    update_performance_gear,
 )
+from hkjc_scraper.utils import parse_race_date
 
 
 def save_json(data: list, file_path: Path) -> None:
@@ -43,6 +38,30 @@ def save_json(data: list, file_path: Path) -> None:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
 
+def parse_date_arg(value: str) -> str:
+    """Validate a YYYY/MM/DD date argument.
+
+    Applies the same rule as ``parse_race_date`` (leading zeros optional),
+    so anything accepted here is accepted by discovery too.
+
+    Args:
+        value: Date string from the command line, e.g. 2015/01/01 or 2015/1/1
+
+    Returns:
+        The date normalized to zero-padded YYYY/MM/DD format
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a valid date
+    """
+    try:
+        parsed = parse_race_date(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid date '{value}' (expected YYYY/MM/DD)"
+        ) from None
+    return parsed.date().isoformat().replace("-", "/")
+
+
 def group_items_by_table(items: list) -> dict:
     """Group scraped items by table name.
 
@@ -55,65 +74,90 @@ def group_items_by_table(items: list) -> dict:
     grouped = {}
     for item in items:
         table = item.get("table", "unknown")
-        if table not in grouped:
-            grouped[table] = []
-        grouped[table].append(item.get("data", {}))
+        grouped.setdefault(table, []).append(item.get("data", {}))
     return grouped
 
 
-def _setup_db(database_url: str | None = None) -> None:
-    """Ensure database schema exists."""
-    url = database_url or os.environ.get("DATABASE_URL")
-    create_database(url)
+def _save_tables(grouped: dict, output_dir: str, suffix: str) -> None:
+    """Save each table's records to ``{table}_{suffix}.json`` in output_dir.
+
+    Args:
+        grouped: Dict of {table_name: [records]}.
+        output_dir: Directory to write the JSON files to.
+        suffix: File name suffix, e.g. a date or "batch".
+    """
+    out_path = Path(output_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+    for table_name, data in grouped.items():
+        if data:
+            file_path = out_path / f"{table_name}_{suffix}.json"
+            save_json(data, file_path)
+            print(f"Saved {len(data)} {table_name} records to {file_path}")
+
+
+def _print_summary(grouped: dict, requests_count: int) -> None:
+    """Print per-table record counts and the total request count.
+
+    Args:
+        grouped: Dict of {table_name: [records]}.
+        requests_count: Number of requests made by the spider.
+    """
+    print("\nSummary:")
+    for table_name, data in grouped.items():
+        print(f"  {table_name}: {len(data)} records")
+    print(f"  Total requests: {requests_count}")
+
+
+def _setup_db(
+    database_url: str | None = None,
+    conn: psycopg2.extensions.connection | None = None,
+) -> None:
+    """Ensure database schema exists, optionally on an existing connection."""
+    create_database(database_url, conn=conn)
 
 
 def _flush_to_db(
     grouped: dict,
     database_url: str | None = None,
     accumulator: dict[str, int] | None = None,
+    conn: psycopg2.extensions.connection | None = None,
 ) -> None:
     """Flush in-memory grouped data to PostgreSQL and update counts.
 
+    All tables are written in a single transaction, so a flush either lands
+    completely or not at all.
+
     Args:
         grouped: Dict of {table_name: [records]} to import.
         database_url: PostgreSQL connection string.
         accumulator: Optional dict to accumulate per-table counts across calls.
+        conn: Optional open connection to reuse across flushes. If None, a
+            connection is opened and closed for this flush only.
     """
-    url = database_url or os.environ.get("DATABASE_URL")
-    conn = get_db_connection(url)
+    counts: dict[str, int] = {}
+    owns_conn = conn is None
+    if owns_conn:
+        conn = get_db_connection(database_url)
     try:
-        for table_name in _TABLE_ORDER:
+        for table_name in TABLE_ORDER:
             records = grouped.get(table_name, [])
             if not records:
                 continue
-            importer = _TABLE_IMPORTERS[table_name]
-            inserted = importer(records, conn)
-            conn.commit()
-            if accumulator is not None:
-                accumulator[table_name] = accumulator.get(table_name, 0) + inserted
+            importer = TABLE_IMPORTERS[table_name]
+            counts[table_name] = importer(records, conn)
+        conn.commit()
+    except Exception:
+        # Leave a shared connection usable for the next flush
+        conn.rollback()
+        raise
     finally:
-        conn.close()
-
-
-_TABLE_IMPORTERS = {
-    "races": import_races,
-    "horses": import_horses,
-    "jockeys": import_jockeys,
-    "trainers": import_trainers,
-    "performance": import_performance,
-    "dividends": import_dividends,
-    "incidents": import_incidents,
-    "sectional_times": import_sectional_times,
-    "performance_gear": update_performance_gear,
-}
-
-# Parent tables first to satisfy foreign keys.
-# performance_gear runs last — it updates existing performance rows.
-_TABLE_ORDER = [
-    "races", "horses", "jockeys", "trainers",
-    "performance", "dividends", "incidents", "sectional_times",
-    "performance_gear",
-]
+        if owns_conn:
+            conn.close()
+
+    # Only count records once they are committed
+    if accumulator is not None:
+        for table_name, inserted in counts.items():
+            accumulator[table_name] = accumulator.get(table_name, 0) + inserted
 
 
 def export_to_db(
@@ -134,12 +178,15 @@ def export_to_db(
     print("\nExporting to PostgreSQL database...")
     try:
         if grouped:
-            _setup_db(database_url)
             counts: dict[str, int] = {}
-            _flush_to_db(grouped, database_url, counts)
+            conn = get_db_connection(database_url)
+            try:
+                _setup_db(conn=conn)
+                _flush_to_db(grouped, accumulator=counts, conn=conn)
+            finally:
+                conn.close()
         else:
-            url = database_url or os.environ.get("DATABASE_URL")
-            counts = export_json_to_db(output_dir, url)
+            counts = export_json_to_db(output_dir, database_url)
 
         print("\nDatabase export summary:")
         for table, count in counts.items():
@@ -167,6 +214,8 @@ async def crawl_race(
     Returns:
         Dictionary with table names as keys and lists of scraped data
     """
+    from hkjc_scraper.spider import HKJCRacingSpider
+
     spider = HKJCRacingSpider(
         dates=[date] if date else None,
         racecourse=racecourse,
@@ -176,21 +225,10 @@ async def crawl_race(
 
     if not export_db:
         # Save each table's data to a separate JSON file
-        out_path = Path(output_dir)
-        out_path.mkdir(parents=True, exist_ok=True)
         date_str = date.replace("/", "-") if date else "latest"
-        for table_name, data in grouped.items():
-            if data:
-                file_path = out_path / f"{table_name}_{date_str}.json"
-                with open(file_path, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
-                print(f"Saved {len(data)} {table_name} records to {file_path}")
-
-    # Print summary
-    print(f"\nSummary:")
-    for table_name, data in grouped.items():
-        print(f"  {table_name}: {len(data)} records")
-    print(f"  Total requests: {result.stats.requests_count}")
+        _save_tables(grouped, output_dir, date_str)
+
+    _print_summary(grouped, result.stats.requests_count)
 
     # Export to database directly from memory
     if export_db:
@@ -211,12 +249,12 @@ async def async_main() -> None:
     )
     parser.add_argument(
         "--start-date",
-        type=str,
+        type=parse_date_arg,
         help="Start date for discovery/scraping (YYYY/MM/DD format)"
     )
     parser.add_argument(
         "--end-date",
-        type=str,
+        type=parse_date_arg,
         help="End date for discovery/scraping (YYYY/MM/DD format)"
     )
     parser.add_argument(
@@ -231,7 +269,9 @@ async def async_main() -> None:
     )
 
     # Existing options
-    parser.add_argument("--date", help="Race date (YYYY/MM/DD format)")
+    parser.add_argument(
+        "--date", type=parse_date_arg, help="Race date (YYYY/MM/DD format)",
+    )
     parser.add_argument(
         "--latest",
         action="store_true",
@@ -260,6 +300,12 @@ async def async_main() -> None:
 
     args = parser.parse_args()
 
+    # Deferred so --help and argument errors don't pay for importing scrapling
+    from hkjc_scraper.spider import HKJCRacingSpider
+
+    # Resolve the database URL once; helpers pass it through unchanged
+    database_url = args.database_url or os.environ.get("DATABASE_URL")
+
     # Handle --auto-all mode
     start_date = args.start_date
     end_date = args.end_date
@@ -286,12 +332,12 @@ async def async_main() -> None:
             print(f"  {entry['date']} @ {entry['racecourse']} ({entry['race_count']} races)")
 
         if args.export_db:
-            export_to_db(args.output, args.database_url)
+            export_to_db(args.output, database_url)
         return
 
     # Handle --latest mode: discover and scrape today's races
     if args.latest:
-        today = datetime.now().strftime("%Y/%m/%d")
+        today = date.today().isoformat().replace("-", "/")
         spider = HKJCRacingSpider()
         print(f"Discovering races for {today}...")
         dates = await spider.discover_dates(
@@ -325,23 +371,12 @@ async def async_main() -> None:
 
         if not args.export_db:
             # Save each table's data to a separate JSON file
-            out_path = Path(args.output)
-            out_path.mkdir(parents=True, exist_ok=True)
-            for table_name, data in grouped.items():
-                if data:
-                    file_path = out_path / f"{table_name}_{today.replace('/', '-')}.json"
-                    with open(file_path, "w", encoding="utf-8") as f:
-                        json.dump(data, f, indent=2, ensure_ascii=False)
-                    print(f"Saved {len(data)} {table_name} records to {file_path}")
-
-        # Print summary
-        print(f"\nSummary:")
-        for table_name, data in grouped.items():
-            print(f"  {table_name}: {len(data)} records")
-        print(f"  Total requests: {result.stats.requests_count}")
+            _save_tables(grouped, args.output, today.replace("/", "-"))
+
+        _print_summary(grouped, result.stats.requests_count)
 
         if args.export_db:
-            export_to_db(args.output, args.database_url, grouped=grouped)
+            export_to_db(args.output, database_url, grouped=grouped)
         return
 
     # Handle --start-date mode: discover dates first, then scrape discovered dates
@@ -358,16 +393,39 @@ async def async_main() -> None:
 
         if args.export_db:
             # Stream to DB: scrape one date at a time to keep memory bounded
-            _setup_db(args.database_url)
             total_counts: dict[str, int] = {}
-            for i, d in enumerate(date_strings, 1):
-                print(f"\n[{i}/{len(date_strings)}] Scraping {d}...")
-                per_date_spider = HKJCRacingSpider(
-                    dates=[d], racecourse=args.racecourse,
-                )
-                result = await per_date_spider.run()
-                grouped = group_items_by_table(result.items)
-                _flush_to_db(grouped, args.database_url, total_counts)
+            # One connection for the whole run instead of one per date
+            conn = get_db_connection(database_url)
+            # Each date's flush runs in a worker thread while the next date
+            # is scraped; at most one flush is in flight (single writer)
+            pending_flush: asyncio.Task | None = None
+            try:
+                _setup_db(conn=conn)
+                for i, d in enumerate(date_strings, 1):
+                    print(f"\n[{i}/{len(date_strings)}] Scraping {d}...")
+                    per_date_spider = HKJCRacingSpider(
+                        dates=[d], racecourse=args.racecourse,
+                    )
+                    result = await per_date_spider.run()
+                    grouped = group_items_by_table(result.items)
+                    if pending_flush is not None:
+                        flush, pending_flush = pending_flush, None
+                        await flush
+                    pending_flush = asyncio.create_task(asyncio.to_thread(
+                        _flush_to_db, grouped, accumulator=total_counts, conn=conn,
+                    ))
+                if pending_flush is not None:
+                    flush, pending_flush = pending_flush, None
+                    await flush
+            finally:
+                # Only reached with a flush still set when scraping failed:
+                # never close the connection under it, and report its error
+                # rather than letting it vanish behind the scrape failure
+                if pending_flush is not None:
+                    await asyncio.wait([pending_flush])
+                    if not pending_flush.cancelled() and pending_flush.exception():
+                        print(f"Warning: Database flush failed: {pending_flush.exception()}")
+                conn.close()
 
             print("\nDatabase export summary:")
             for table, count in total_counts.items():
@@ -380,19 +438,8 @@ async def async_main() -> None:
             result = await spider.run()
             grouped = group_items_by_table(result.items)
 
-            out_path = Path(args.output)
-            out_path.mkdir(parents=True, exist_ok=True)
-            for table_name, data in grouped.items():
-                if data:
-                    file_path = out_path / f"{table_name}_batch.json"
-                    with open(file_path, "w", encoding="utf-8") as f:
-                        json.dump(data, f, indent=2, ensure_ascii=False)
-                    print(f"Saved {len(data)} {table_name} records to {file_path}")
-
-            print(f"\nSummary:")
-            for table_name, data in grouped.items():
-                print(f"  {table_name}: {len(data)} records")
-            print(f"  Total requests: {result.stats.requests_count}")
+            _save_tables(grouped, args.output, "batch")
+            _print_summary(grouped, result.stats.requests_count)
         return
 
     # Default behavior: scrape single date
@@ -401,7 +448,7 @@ async def async_main() -> None:
         args.racecourse,
         args.output,
         args.export_db,
-        args.database_url,
+        database_url,
     )
 
 
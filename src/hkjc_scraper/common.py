@@ -6,7 +6,10 @@ may change without notice.
 """
 
 import re
-from typing import Any
+from typing import Any, Final
+
+_CAREER_WINS_PATTERN: Final = re.compile(r'在港累積\s*(\d+)\s*場')
+_WIN_RATE_PATTERN: Final = re.compile(r'百分之\s*([\d.]+)')
 
 
 def parse_career_record(record_str: str) -> dict | None:
@@ -80,8 +83,8 @@ def _parse_career_stats_from_elements(elements: list[Any] | None) -> tuple[int,
         text = element.text
         if "在港累積" in text and "場" in text and "勝出率" in text and "百分之" in text:
             # Parse: "在港累積232場勝出率百分之12.4"
-            wins_match = re.search(r'在港累積\s*(\d+)\s*場', text)
-            rate_match = re.search(r'百分之\s*([\d.]+)', text)
+            wins_match = _CAREER_WINS_PATTERN.search(text)
+            rate_match = _WIN_RATE_PATTERN.search(text)
             if wins_match and rate_match:
                 try:
                     return (int(wins_match.group(1)), float(rate_match.group(1)))
@@ -14,8 +14,9 @@ from __future__ import annotations
 
 import json
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Final
 
 import psycopg2
 import psycopg2.extras
@@ -49,11 +50,23 @@ def get_database_url() -> str:
     return url
 
 
+# TCP keepalives so a connection idling while a date is scraped is not
+# silently dropped by NAT/firewalls; probe after 30s idle, every 10s, 5 times
+_KEEPALIVE_PARAMS: Final = {
+    "keepalives": 1,
+    "keepalives_idle": 30,
+    "keepalives_interval": 10,
+    "keepalives_count": 5,
+}
+
+
 def get_db_connection(
     database_url: str | None = None,
 ) -> psycopg2.extensions.connection:
     """Get a PostgreSQL database connection.
 
+    TCP keepalives are enabled unless the URL sets them itself.
+
     Args:
         database_url: PostgreSQL connection string.
             If None, reads from DATABASE_URL env var.
@@ -62,10 +75,37 @@ def get_db_connection(
         A psycopg2 connection.
     """
     url = database_url or get_database_url()
-    return psycopg2.connect(url)
+    dsn_params = psycopg2.extensions.parse_dsn(url)
+    keepalives = {
+        key: value for key, value in _KEEPALIVE_PARAMS.items()
+        if key not in dsn_params
+    }
+    return psycopg2.connect(url, **keepalives)
 
 
-def create_database(database_url: str | None = None) -> None:
+@lru_cache(maxsize=1)
+def _load_schema_sql() -> str:
+    """Read docker/init.sql once per process.
+
+    Returns:
+        The schema SQL text.
+
+    Raises:
+        FileNotFoundError: If docker/init.sql does not exist.
+    """
+    init_sql = Path(__file__).parent.parent.parent / "docker" / "init.sql"
+    if not init_sql.exists():
+        raise FileNotFoundError(
+            f"Schema file not found: {init_sql}. "
+            "Ensure docker/init.sql exists in the project root."
+        )
+    return init_sql.read_text()
+
+
+def create_database(
+    database_url: str | None = None,
+    conn: psycopg2.extensions.connection | None = None,
+) -> None:
     """Create the PostgreSQL database schema with all tables and indexes.
 
     Reads and executes the docker/init.sql schema file. Safe to run multiple
@@ -74,20 +114,20 @@ def create_database(database_url: str | None = None) -> None:
     Args:
         database_url: PostgreSQL connection string.
             If None, reads from DATABASE_URL env var.
+        conn: Optional open connection to apply the schema on. If given,
+            it is committed but left open for the caller's later work.
     """
-    conn = get_db_connection(database_url)
+    schema_sql = _load_schema_sql()
+    owns_conn = conn is None
+    if owns_conn:
+        conn = get_db_connection(database_url)
     try:
         cursor = conn.cursor()
-        init_sql = Path(__file__).parent.parent.parent / "docker" / "init.sql"
-        if not init_sql.exists():
-            raise FileNotFoundError(
-                f"Schema file not found: {init_sql}. "
-                "Ensure docker/init.sql exists in the project root."
-            )
-        cursor.execute(init_sql.read_text())
+        cursor.execute(schema_sql)
         conn.commit()
     finally:
-        conn.close()
+        if owns_conn:
+            conn.close()
 
 
 # ---------------------------------------------------------------------------
@@ -151,7 +191,9 @@ def _batch_upsert(
 
     cursor = conn.cursor()
     for batch in _chunks(rows, batch_size):
-        execute_values(cursor, sql, batch, template=template)
+        # Send the whole batch as one statement (execute_values would
+        # otherwise split it into pages of 100 rows)
+        execute_values(cursor, sql, batch, template=template, page_size=len(batch))
 
     return len(rows)
 
@@ -461,39 +503,77 @@ def import_sectional_times(
 
 
 def update_performance_gear(
-    data: list[dict], conn: psycopg2.extensions.connection,
+    data: list[dict],
+    conn: psycopg2.extensions.connection,
+    batch_size: int = 500,
 ) -> int:
     """Update gear on existing performance records.
 
     Uses (race_id, horse_id) to match records since gear data comes from
     horse profile pages where horse_no is not available.
 
+    Records are applied in batches with a single ``UPDATE ... FROM (VALUES ...)``
+    statement per batch instead of one round-trip per record. Duplicate
+    (race_id, horse_id) pairs keep the last record. Rows whose gear already
+    matches are skipped, so re-running an export writes nothing new.
+
     Args:
         data: List of dicts with keys: race_id, horse_id, gear.
         conn: PostgreSQL connection (caller manages transaction).
+        batch_size: Number of records per UPDATE statement.
 
     Returns:
-        Number of records updated.
+        Number of records whose gear changed.
     """
     if not data:
         return 0
 
+    # Postgres applies an arbitrary VALUES row when several match one target
+    # row, so collapse duplicates to the last record like _batch_upsert does
+    latest: dict[tuple[str, str], str] = {}
+    for record in data:
+        if record.get("race_id") and record.get("horse_id") and record.get("gear"):
+            latest[(record["race_id"], record["horse_id"])] = record["gear"]
+    if not latest:
+        return 0
+    rows = [(race_id, horse_id, gear) for (race_id, horse_id), gear in latest.items()]
+
     cursor = conn.cursor()
     updated = 0
-    for record in data:
-        race_id = record.get("race_id")
-        horse_id = record.get("horse_id")
-        gear = record.get("gear")
-        if not race_id or not horse_id or not gear:
-            continue
-        cursor.execute(
-            "UPDATE performance SET gear = %s WHERE race_id = %s AND horse_id = %s",
-            (gear, race_id, horse_id),
-        )
+    for batch in _chunks(rows, batch_size):
+        # page_size covers the whole batch so rowcount reflects every row
+        execute_values(cursor, """
+            UPDATE performance AS p SET gear = v.gear
+            FROM (VALUES %s) AS v(race_id, horse_id, gear)
+            WHERE p.race_id = v.race_id AND p.horse_id = v.horse_id
+              AND p.gear IS DISTINCT FROM v.gear
+        """, batch, page_size=len(batch))
         updated += cursor.rowcount
     return updated
 
 
+# Table name -> importer, shared by JSON export and the CLI's in-memory flush
+TABLE_IMPORTERS: dict[str, Callable[..., int]] = {
+    "races": import_races,
+    "horses": import_horses,
+    "jockeys": import_jockeys,
+    "trainers": import_trainers,
+    "performance": import_performance,
+    "dividends": import_dividends,
+    "incidents": import_incidents,
+    "sectional_times": import_sectional_times,
+    "performance_gear": update_performance_gear,
+}
+
+# Parent tables first to satisfy foreign keys.
+# performance_gear runs last — it updates existing performance rows.
+TABLE_ORDER: list[str] = [
+    "races", "horses", "jockeys", "trainers",
+    "performance", "dividends", "incidents", "sectional_times",
+    "performance_gear",
+]
+
+
 # ---------------------------------------------------------------------------
 # Bulk export / query
 # ---------------------------------------------------------------------------
@@ -519,52 +599,39 @@ def export_json_to_db(
     if not data_path.exists():
         raise FileNotFoundError(f"Data directory not found: {data_path}")
 
-    create_database(database_url)
-
     conn = get_db_connection(database_url)
     try:
+        create_database(conn=conn)
         counts: dict[str, int] = {}
 
-        importers: dict[str, Callable] = {
-            "races": import_races,
-            "horses": import_horses,
-            "jockeys": import_jockeys,
-            "trainers": import_trainers,
-            "performance": import_performance,
-            "dividends": import_dividends,
-            "incidents": import_incidents,
-            "sectional_times": import_sectional_times,
-        }
-
-        # Parent tables first to satisfy foreign keys
-        table_order = [
-            "races", "horses", "jockeys", "trainers",
-            "performance", "dividends", "incidents", "sectional_times",
-        ]
-
-        json_files = list(data_path.glob("*.json"))
-
-        for table_name in table_order:
-            importer = importers[table_name]
-            table_files = [
-                f for f in json_files
-                if f.stem.startswith(table_name + "_")
-            ]
+        # Group files by table; the suffix after the last "_" is the date,
+        # "latest" or "batch", so performance_gear_* never lands in performance
+        files_by_table: dict[str, list[Path]] = {}
+        for json_file in data_path.glob("*.json"):
+            table_name = json_file.stem.rsplit("_", 1)[0]
+            files_by_table.setdefault(table_name, []).append(json_file)
+
+        for table_name in TABLE_ORDER:
+            importer = TABLE_IMPORTERS[table_name]
+            table_files = files_by_table.get(table_name, [])
 
+            # One importer call per table: batches span file boundaries and
+            # duplicates across files collapse to the newest (last) record
+            records: list[dict] = []
             for json_file in sorted(table_files):
                 with open(json_file, encoding="utf-8") as f:
-                    records = json.load(f)
+                    records.extend(json.load(f))
 
-                if not records:
-                    continue
+            if not records:
+                continue
 
-                inserted = importer(records, conn)
-                conn.commit()
-                counts[table_name] = counts.get(table_name, 0) + inserted
-                print(
-                    f"Imported {inserted} records into "
-                    f"{table_name} from {json_file.name}"
-                )
+            inserted = importer(records, conn)
+            conn.commit()
+            counts[table_name] = inserted
+            print(
+                f"Imported {inserted} records into "
+                f"{table_name} from {len(table_files)} file(s)"
+            )
 
         return counts
     finally:
@@ -591,6 +658,9 @@ def load_from_db(
     """
     conn = get_db_connection(database_url)
     try:
+        # A lone SELECT needs no transaction; autocommit skips the implicit
+        # BEGIN psycopg2 would otherwise send (no extra round-trip to set it)
+        conn.autocommit = True
         cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
 
         query = f"SELECT * FROM {table}"
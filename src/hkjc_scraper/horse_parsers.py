@@ -13,6 +13,7 @@ from .data_parsers import generate_race_id
 _CAREER_RECORD_PATTERN = re.compile(
     r'冠-亞-季-總出賽次數\*?\s*[：:]?\s*(\d+)-(\d+)-(\d+)-(\d+)'
 )
+_CAREER_NUMBERS_PATTERN = re.compile(r'(\d+)-(\d+)-(\d+)-(\d+)')
 
 
 def parse_horse_profile(response: Any, horse_id: str, horse_name: str) -> dict:
@@ -180,7 +181,7 @@ def parse_horse_profile(response: Any, horse_id: str, horse_name: str) -> dict:
             )
             if matches and matches.text:
                 # Extract numbers from the matched text
-                career_match = re.search(r'(\d+)-(\d+)-(\d+)-(\d+)', matches.text)
+                career_match = _CAREER_NUMBERS_PATTERN.search(matches.text)
                 if career_match:
                     record_str = (
                         f"{career_match.group(1)}-{career_match.group(2)}-"
@@ -1,8 +1,12 @@
 """HKJC Racing Spider - Proper Scrapling Spider implementation."""
 
 import asyncio
-import random
 import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Final
+from zoneinfo import ZoneInfo
+
 from scrapling.spiders import Spider, Request
 from scrapling.fetchers import Fetcher, FetcherSession
 
@@ -32,6 +36,41 @@ from hkjc_scraper.jockey_trainer_parsers import (
     parse_trainer_profile as parse_trainer_profile_data,
 )
 
+_RACE_NO_PATTERN: Final = re.compile(r'RaceNo=(\d+)')
+_RACE_CLASS_PATTERN: Final = re.compile(r'第[一二三四五六七八九]班')
+_DISTANCE_PATTERN: Final = re.compile(r'(\d+)米')
+_RATING_PATTERN: Final = re.compile(r'[(\uff08](\d+)-(\d+)[)\uff09]')
+
+# Page text indicating a date/racecourse has no race data
+_NO_DATA_PATTERNS: Final = (
+    "沒有赛事",  # No races (Chinese)
+    "沒有賽事",
+    "No races",
+    "暫沒有賽事",  # No races at the moment
+)
+
+# HKJC race dates are Hong Kong calendar dates, whatever the host timezone
+_HK_TZ: Final = ZoneInfo("Asia/Hong_Kong")
+
+# Discovery: max in-flight date checks, and how often to persist the cache
+_DISCOVERY_CONCURRENCY: Final = 50
+_CACHE_SAVE_INTERVAL: Final = 50
+
+
+def _page_says_no_races(response) -> bool:
+    """Check if the page explicitly states there are no races.
+
+    Args:
+        response: Scrapling response object
+
+    Returns:
+        True if one of the no-data indicators is in the page text
+    """
+    # Note: response.text returns an empty TextHandler for Fetcher responses
+    # Use get_all_text() instead to get the actual text content
+    text = str(response.get_all_text())
+    return any(pattern in text for pattern in _NO_DATA_PATTERNS)
+
 
 def _is_valid_race_page(response) -> bool:
     """Check if response contains valid race data.
@@ -43,23 +82,21 @@ def _is_valid_race_page(response) -> bool:
         True if page has valid race data, False otherwise
     """
     # Check for common indicators of no data
-    # Note: response.text returns an empty TextHandler for Fetcher responses
-    # Use get_all_text() instead to get the actual text content
-    text = str(response.get_all_text())
+    if _page_says_no_races(response):
+        return False
+
+    return _has_race_links(response)
 
-    # No data indicators
-    no_data_patterns = [
-        "沒有赛事",  # No races (Chinese)
-        "沒有賽事",
-        "No races",
-        "暫沒有賽事",  # No races at the moment
-    ]
 
-    for pattern in no_data_patterns:
-        if pattern in text:
-            return False
+def _has_race_links(response) -> bool:
+    """Check if the page has a race number selector or race links.
 
-    # Check for race number selector or links
+    Args:
+        response: Scrapling response object
+
+    Returns:
+        True if race number options or links are present, False otherwise
+    """
     # Valid pages have race number options or links
     if response.css("#selectId option"):
         return True
@@ -90,51 +127,56 @@ def _count_races(response) -> int:
         # Extract unique race numbers
         race_numbers = set()
         for link in race_links:
-            href = link.attrib.get("href", "")
-            # Extract RaceNo=XX from href
-            if "RaceNo=" in href:
-                match = re.search(r'RaceNo=(\d+)', href)
-                if match:
-                    race_numbers.add(int(match.group(1)))
+            # The selector already guarantees RaceNo= in href
+            match = _RACE_NO_PATTERN.search(link.attrib.get("href", ""))
+            if match:
+                race_numbers.add(int(match.group(1)))
 
         return len(race_numbers) if race_numbers else 1
 
     return 1  # Default to at least 1 race
 
 
-async def _check_date_with_session(session: FetcherSession, date: str, racecourse: str, cache: DiscoveryCache) -> dict | None:
+async def _check_date_with_session(
+    session: FetcherSession,
+    date: str,
+    racecourse: str,
+    cache: DiscoveryCache,
+    cache_empty: bool = False,
+) -> dict | None:
     """Check if races exist for a specific date and racecourse using FetcherSession.
 
+    Cache and season-break lookups are done by the caller, so this always
+    fetches the page.
+
     Args:
         session: FetcherSession instance
         date: Race date in YYYY/MM/DD format
         racecourse: Race course code (ST or HV)
         cache: Discovery cache instance
+        cache_empty: Remember the date if the page says it has no races.
+            Only safe for past dates, whose results pages no longer change.
+            Pages that merely lack race links (maintenance, bot checks,
+            layout changes) are never remembered.
 
     Returns:
         Dictionary with race count if races found, None otherwise
     """
-    # Skip August (season break)
-    if cache.is_season_break(date):
-        cache.mark_season_break(date[:7])  # YYYY-MM format
-        return None
-
-    # Check cache first
-    if cache.is_cached(date, racecourse):
-        # Return cached entry if available
-        for entry in cache.data["discovered"]:
-            if entry["date"] == date and entry["racecourse"] == racecourse:
-                return entry
-        return None
-
     url = f"{HKJCRacingSpider.BASE_URL}?racedate={date}&Racecourse={racecourse}"
 
     # Fetch the page
     response = await session.get(url)
-    if response and _is_valid_race_page(response):
+    if response is None:
+        return None
+
+    # Same checks as _is_valid_race_page, but the page text is only walked once
+    no_races = _page_says_no_races(response)
+    if not no_races and _has_race_links(response):
         count = _count_races(response)
         cache.add_discovery(date, racecourse, count)
         return {"date": date, "racecourse": racecourse, "race_count": count}
+    if cache_empty and no_races and response.status == 200:
+        cache.mark_no_races(date, racecourse)
     return None
 
 
@@ -143,17 +185,22 @@ async def discover_dates(
     end_date: str,
     racecourses: list[str] | None = None,
     cache_path: str | None = None,
+    refresh_cache: bool = False,
 ) -> list[dict]:
     """Discover race dates within a range.
 
+    Past dates found to have no races are cached too, so reruns over the
+    same range only fetch dates that are new or still upcoming.
+
     Args:
         start_date: Start date in YYYY/MM/DD format
         end_date: End date in YYYY/MM/DD format
         racecourses: List of racecourse codes (default: ['ST', 'HV'])
         cache_path: Path to cache file
+        refresh_cache: Re-fetch every date instead of trusting cached results
 
     Returns:
-        List of dictionaries with discovered race dates
+        List of dictionaries with discovered race dates, sorted by date
     """
     if racecourses is None:
         racecourses = ['ST', 'HV']
@@ -162,40 +209,66 @@ async def discover_dates(
     cache.load()
     discovered = []
 
-    # Pre-build all combinations to process
-    combinations = [
-        (date, racecourse)
-        for date in generate_date_range(start_date, end_date)
-        for racecourse in racecourses
-    ]
+    # Resolve cached and season-break dates up front so only uncached
+    # combinations are fetched
+    combinations = []
+    for date in generate_date_range(start_date, end_date):
+        if cache.is_season_break(date):
+            cache.mark_season_break(date[:7])  # YYYY-MM format
+            continue
+        for racecourse in racecourses:
+            if not refresh_cache:
+                entry = cache.get_entry(date, racecourse)
+                if entry is not None:
+                    discovered.append(entry)
+                    continue
+                if cache.has_no_races(date, racecourse):
+                    continue
+            combinations.append((date, racecourse))
+
+    # Sliding window: a new check starts as soon as any in-flight one
+    # finishes, instead of waiting for the slowest request in a fixed chunk
+    semaphore = asyncio.Semaphore(_DISCOVERY_CONCURRENCY)
+
+    # YYYY/MM/DD strings compare in date order; "today" is today in Hong
+    # Kong, so a host ahead of HKT never treats today's meeting as past
+    today = datetime.now(_HK_TZ).date().isoformat().replace("-", "/")
+
+    async def _bounded_check(d: str, rc: str) -> dict | None:
+        async with semaphore:
+            return await _check_date_with_session(
+                session, d, rc, cache, cache_empty=d < today,
+            )
 
-    # Process in chunks for parallel execution with crash resilience
-    CHUNK_SIZE = 50
     async with FetcherSession() as session:
-        for i in range(0, len(combinations), CHUNK_SIZE):
-            chunk = combinations[i:i + CHUNK_SIZE]
-
-            # Process all items in this chunk in parallel
-            tasks = [
-                _check_date_with_session(session, d, rc, cache)
-                for d, rc in chunk
-            ]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Collect non-None results and log errors
-            for result in results:
-                if isinstance(result, Exception):
-                    # Log warning but continue processing
-                    print(f"Warning: Discovery check failed: {result}")
-                elif result:
-                    discovered.append(result)
-
-            # Save cache after each chunk (crash resilience)
-            cache.save()
+        tasks = [asyncio.create_task(_bounded_check(d, rc)) for d, rc in combinations]
+        for done, task in enumerate(asyncio.as_completed(tasks), 1):
+            try:
+                result = await task
+            except Exception as e:
+                # Log warning but continue processing
+                print(f"Warning: Discovery check failed: {e}")
+                continue
+            if result:
+                discovered.append(result)
+
+            # Save cache periodically (crash resilience)
+            if done % _CACHE_SAVE_INTERVAL == 0:
+                cache.save()
 
+    cache.save()
+    discovered.sort(key=lambda entry: (entry["date"], entry["racecourse"]))
     return discovered
 
 
+@dataclass(slots=True)
+class CrawlResult:
+    """Items and stats collected by HKJCRacingSpider.run()."""
+
+    items: list[dict]
+    stats: Any
+
+
 class HKJCRacingSpider(Spider):
     """Spider for crawling HKJC horse racing data using async pattern."""
 
@@ -229,7 +302,8 @@ class HKJCRacingSpider(Spider):
     def fetch(self, url: str):
         """Fetch a URL directly using Fetcher.
 
-        Used by discover_dates for initial race discovery.
+        One-off convenience helper; each call opens its own connection.
+        Discovery and crawling reuse pooled sessions instead.
 
         Args:
             url: URL to fetch
@@ -241,18 +315,18 @@ class HKJCRacingSpider(Spider):
 
     async def start_requests(self):
         if self.dates:
+            racecourse = self.racecourse or "ST"
             for date in self.dates:
-                racecourse = self.racecourse or "ST"
                 url = f"{self.BASE_URL}?racedate={date}&Racecourse={racecourse}"
                 yield Request(url, callback=self.parse_all_results, meta={"date": date, "racecourse": racecourse})
         else:
             yield Request(self.BASE_URL, callback=self.parse_discover_dates)
 
     async def parse_discover_dates(self, response):
+        racecourse = self.racecourse or "ST"
         for opt in response.css("#selectId option"):
             date_val = opt.attrib.get("value")
             if date_val:
-                racecourse = self.racecourse or "ST"
                 url = f"{self.BASE_URL}?racedate={date_val}&Racecourse={racecourse}"
                 yield response.follow(url, callback=self.parse_all_results, meta={"date": date_val, "racecourse": racecourse})
 
@@ -260,10 +334,32 @@ class HKJCRacingSpider(Spider):
         meta = response.meta
         date = meta.get("date", "")
         racecourse = meta.get("racecourse", "ST")
-        for race_no in range(1, 12):
+        for race_no in self._meeting_race_numbers(response):
             url = f"{self.BASE_URL}?racedate={date}&Racecourse={racecourse}&RaceNo={race_no}"
             yield response.follow(url, callback=self.parse_race, meta={"date": date, "racecourse": racecourse, "race_no": race_no})
 
+    @staticmethod
+    def _meeting_race_numbers(response) -> list[int]:
+        """Get the race numbers run at a meeting from its results page.
+
+        The results landing page shows race 1 and links the remaining races
+        from the race card navigation, so only races that exist are requested.
+
+        Args:
+            response: Results page response for the meeting
+
+        Returns:
+            Sorted race numbers, or 1-11 if the race card links are missing
+        """
+        race_numbers = {1}
+        for link in response.css('table.js_racecard a[href*="RaceNo="]'):
+            match = _RACE_NO_PATTERN.search(link.attrib.get("href", ""))
+            if match:
+                race_numbers.add(int(match.group(1)))
+        if len(race_numbers) == 1:
+            return list(range(1, 12))
+        return sorted(race_numbers)
+
     async def parse_race(self, response):
         meta = response.meta
         date = meta.get("date", "")
@@ -297,18 +393,14 @@ class HKJCRacingSpider(Spider):
             yield inc_item
 
         # Extract sectional time href and yield request
-        sectional_href = None
-        for link in response.css("a"):
-            href = link.attrib.get("href", "")
-            if "displaysectionaltime" in href:
-                sectional_href = href
-                break
+        sectional_links = response.css('a[href*="displaysectionaltime"]')
+        sectional_href = sectional_links[0].attrib.get("href") if sectional_links else None
 
         if sectional_href:
             url = response.urljoin(sectional_href)
             yield Request(url, callback=self.parse_sectional_times, meta={"race_id": race_id})
         else:
-            self.logger.warning(f"No sectional time link found for race {race_id}")
+            self.logger.warning("No sectional time link found for race %s", race_id)
 
         # Yield profile fetching requests directly
         # Fetch horse profiles
@@ -363,9 +455,10 @@ class HKJCRacingSpider(Spider):
         # Extract race info from the race table
         # The race info is typically in a table with class "race_tab" or similar
         race_tables = response.css(".race_tab table tbody tr")
+        # Select each row's cells once; both passes below reuse them
+        race_rows = [row.css("td") for row in race_tables]
 
-        for row in race_tables:
-            cells = row.css("td")
+        for cells in race_rows:
             if len(cells) < 2:
                 continue
 
@@ -377,19 +470,19 @@ class HKJCRacingSpider(Spider):
             first_cell_text = cells[0].text if cells[0].text else ""
 
             # Extract class (第X班)
-            class_match = re.search(r'第[一二三四五六七八九]班', first_cell_text)
+            class_match = _RACE_CLASS_PATTERN.search(first_cell_text)
             if class_match:
                 race_data["class"] = class_match.group(0)
 
             # Extract distance (digits followed by 米)
-            distance_match = re.search(r'(\d+)米', first_cell_text)
+            distance_match = _DISTANCE_PATTERN.search(first_cell_text)
             if distance_match:
                 race_data["distance"] = int(distance_match.group(1))
 
             # Extract rating ((high-low) or full-width version)
             # HKJC displays ratings as "(60-40)" where 60 is the higher rating
             # and 40 is the lower rating for horses eligible for this race
-            rating_match = re.search(r'[(\uff08](\d+)-(\d+)[)\uff09]', first_cell_text)
+            rating_match = _RATING_PATTERN.search(first_cell_text)
             if rating_match:
                 race_data["rating"] = {
                     "high": int(rating_match.group(1)),
@@ -431,8 +524,7 @@ class HKJCRacingSpider(Spider):
         # The race name is typically in the first cell of a row,
         # and the prize money (HK$) is in the first cell of another row.
         # The race name row often has "賽道 :" in the second cell.
-        for row in race_tables:
-            cells = row.css("td")
+        for cells in race_rows:
             if len(cells) < 2:
                 continue
 
@@ -478,7 +570,7 @@ class HKJCRacingSpider(Spider):
         results_table = response.css("table.draggable")
         if not results_table:
             return
-        rows = results_table[0].css("tbody tr")
+        rows = results_table[0].css("tbody > tr")
         for row in rows:
             cells = row.css("td")
             if len(cells) >= 12:
@@ -539,10 +631,10 @@ class HKJCRacingSpider(Spider):
             Dictionaries with "table": "dividends" and dividend data
         """
         for table in response.css("table.table_bd"):
-            header = table.css("thead tr td")
+            header = table.css("thead > tr > td")
             if header and "派彩" in header[0].text:
                 current_pool = None
-                for row in table.css("tbody tr"):
+                for row in table.css("tbody > tr"):
                     cells = row.css("td")
                     # Handle rows with 3 cells (has pool name) or 2 cells (rowspan continuation)
                     if len(cells) >= 2:
@@ -579,9 +671,9 @@ class HKJCRacingSpider(Spider):
             Dictionaries with "table": "incidents" and incident data
         """
         for table in response.css("table.table_bd"):
-            header = table.css("thead tr td")
+            header = table.css("thead > tr > td")
             if header and any("競賽事件" in h.text for h in header):
-                for row in table.css("tbody tr"):
+                for row in table.css("tbody > tr"):
                     cells = row.css("td")
                     if len(cells) >= 4:
                         horse_link = cells[2].css("a")
@@ -634,19 +726,19 @@ class HKJCRacingSpider(Spider):
         # Check for "沒有相關資料" or similar empty state
         page_text = response.get_all_text()
         if "沒有相關資料" in page_text or "不提供" in page_text:
-            self.logger.warning(f"No sectional time data available for race {race_id}")
+            self.logger.warning("No sectional time data available for race %s", race_id)
             return
 
         # Find the main sectional table
         # The table has rows with horse data, skip header rows
         if "分段時間" not in page_text:
-            self.logger.warning(f"No sectional table found for race {race_id}")
+            self.logger.warning("No sectional table found for race %s", race_id)
             return
 
         # Get all table rows
         rows = response.css("table tbody tr")
         if not rows:
-            self.logger.warning(f"No sectional table found for race {race_id}")
+            self.logger.warning("No sectional table found for race %s", race_id)
             return
 
         # Process data rows (skip headers)
@@ -730,21 +822,18 @@ class HKJCRacingSpider(Spider):
         """Run the spider and collect all results.
 
         Returns:
-            A result object with items and stats attributes.
+            CrawlResult with the scraped items and crawl stats.
         """
         items = []
         stats = None
         async for item in self.stream():
             items.append(item)
-            # Capture stats during the crawl
-            stats = self.stats
-
-        class Result:
-            def __init__(self, items, stats):
-                self.items = items
-                self.stats = stats
+            # Capture stats during the crawl; the engine keeps updating the
+            # same object, and self.stats raises once stream() has finished
+            if stats is None:
+                stats = self.stats
 
-        return Result(items, stats)
+        return CrawlResult(items, stats)
 
     async def discover_dates(
         self,
@@ -760,9 +849,9 @@ class HKJCRacingSpider(Spider):
         Args:
             start_date: Start date in YYYY/MM/DD format
             end_date: End date in YYYY/MM/DD format
-            refresh_cache: Ignored (kept for backward compatibility)
+            refresh_cache: Re-fetch dates that are already cached
 
         Returns:
             List of dicts with keys: date, racecourse, race_count
         """
-        return await discover_dates(start_date, end_date)
+        return await discover_dates(start_date, end_date, refresh_cache=refresh_cache)
@@ -1,7 +1,11 @@
 """Utility functions for HKJC scraper."""
 
+import re
 from datetime import datetime, timedelta
-from typing import Generator
+from typing import Final, Generator
+
+# Same shape strptime("%Y/%m/%d") accepts: 4-digit year, 1-2 digit month/day
+_RACE_DATE_PATTERN: Final = re.compile(r"\d{4}/\d{1,2}/\d{1,2}", re.ASCII)
 
 
 def generate_date_range(start_date: str, end_date: str) -> Generator[str, None, None]:
@@ -14,22 +18,33 @@ def generate_date_range(start_date: str, end_date: str) -> Generator[str, None,
     Yields:
         Dates in YYYY/MM/DD format
     """
-    start = datetime.strptime(start_date, "%Y/%m/%d")
-    end = datetime.strptime(end_date, "%Y/%m/%d")
+    start = parse_race_date(start_date).date()
+    end = parse_race_date(end_date).date()
 
-    current = start
-    while current <= end:
-        yield current.strftime("%Y/%m/%d")
-        current += timedelta(days=1)
+    for offset in range((end - start).days + 1):
+        # isoformat is a fixed C formatter; strftime interprets its pattern
+        yield (start + timedelta(days=offset)).isoformat().replace("-", "/")
 
 
 def parse_race_date(date_str: str) -> datetime:
     """Parse race date string to datetime.
 
+    Leading zeros are optional ("2015/1/1" is accepted), as with
+    ``strptime("%Y/%m/%d")``.
+
     Args:
         date_str: Date in YYYY/MM/DD format
 
     Returns:
         datetime object
+
+    Raises:
+        ValueError: If the string is not three "/"-separated numbers forming
+            a valid date
     """
-    return datetime.strptime(date_str, "%Y/%m/%d")
+    # Checking the shape first keeps int() from accepting signs, spaces,
+    # underscores or short years; splitting avoids _strptime's setup
+    if not _RACE_DATE_PATTERN.fullmatch(date_str):
+        raise ValueError(f"invalid race date '{date_str}' (expected YYYY/MM/DD)")
+    year, month, day = date_str.split("/")
+    return datetime(int(year), int(month), int(day))
@@ -86,27 +86,33 @@ class TestDatabaseCreation:
         conn.close()
 
         expected_indexes = {
-            "idx_races_race_date",
             "idx_races_racecourse",
             "idx_races_date_course",
             "idx_horses_name",
             "idx_horses_trainer",
             "idx_jockeys_name",
             "idx_trainers_name",
-            "idx_performance_race_id",
             "idx_performance_horse_id",
             "idx_performance_jockey_id",
             "idx_performance_trainer_id",
             "idx_performance_position",
-            "idx_dividends_race_id",
+            "idx_performance_race_horse",
             "idx_incidents_race_id",
             "idx_incidents_horse_no",
-            "idx_sectional_times_race_id",
             "idx_sectional_times_horse_no",
-            "idx_sectional_times_race_horse",
         }
         assert expected_indexes.issubset(indexes), f"Missing: {expected_indexes - indexes}"
 
+        # Prefix-redundant indexes are covered by UNIQUE/composite indexes
+        redundant_indexes = {
+            "idx_races_race_date",
+            "idx_performance_race_id",
+            "idx_dividends_race_id",
+            "idx_sectional_times_race_id",
+            "idx_sectional_times_race_horse",
+        }
+        assert not redundant_indexes & indexes
+
 
 class TestForeignKeyConstraints:
     """Test foreign key constraint enforcement."""
@@ -50,6 +50,57 @@ def test_cache_is_cached():
         assert cache.is_cached("2015/01/02", "ST") is False
 
 
+def test_cache_get_entry():
+    """Test fetching a cached entry in a single lookup."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_path = Path(tmpdir) / "test_cache.json"
+        cache = DiscoveryCache(str(cache_path))
+        cache.add_discovery("2015/01/01", "ST", 8)
+
+        assert cache.get_entry("2015/01/01", "ST") == {
+            "date": "2015/01/01", "racecourse": "ST", "race_count": 8,
+        }
+        assert cache.get_entry("2015/01/01", "HV") is None
+
+
+def test_cache_no_races_round_trip():
+    """Test empty date + racecourse checks are remembered across loads."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_path = Path(tmpdir) / "test_cache.json"
+        cache = DiscoveryCache(str(cache_path))
+        cache.mark_no_races("2015/01/02", "HV")
+        cache.mark_no_races("2015/01/02", "HV")
+        cache.save()
+
+        cache2 = DiscoveryCache(str(cache_path))
+        cache2.load()
+        assert cache2.has_no_races("2015/01/02", "HV") is True
+        assert cache2.has_no_races("2015/01/02", "ST") is False
+        assert cache2.data["no_races"] == [{"date": "2015/01/02", "racecourse": "HV"}]
+
+
+def test_cache_refresh_replaces_stored_results():
+    """Test re-checked dates overwrite the opposite or outdated result."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_path = Path(tmpdir) / "test_cache.json"
+        cache = DiscoveryCache(str(cache_path))
+        cache.add_discovery("2015/01/01", "ST", 8)
+        cache.add_discovery("2015/01/01", "ST", 9)
+        cache.mark_no_races("2015/01/02", "HV")
+        cache.add_discovery("2015/01/02", "HV", 7)
+        cache.mark_no_races("2015/01/01", "ST")
+        cache.save()
+
+        cache2 = DiscoveryCache(str(cache_path))
+        cache2.load()
+        assert cache2.get_discovered() == [
+            {"date": "2015/01/02", "racecourse": "HV", "race_count": 7},
+        ]
+        assert cache2.has_no_races("2015/01/01", "ST") is True
+        assert cache2.has_no_races("2015/01/02", "HV") is False
+        assert cache2.data["no_races"] == [{"date": "2015/01/01", "racecourse": "ST"}]
+
+
 def test_cache_save_and_load():
     """Test saving and loading cache."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -67,6 +118,8 @@ def test_cache_save_and_load():
         discovered = cache2.get_discovered()
         assert len(discovered) == 1
         assert discovered[0] == {"date": "2015/01/01", "racecourse": "ST", "race_count": 8}
+        assert cache2.is_cached("2015/01/01", "ST") is True
+        assert list(Path(tmpdir).iterdir()) == [cache_path]
 
 
 def test_season_break_check():
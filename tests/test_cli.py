@@ -5,7 +5,7 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from hkjc_scraper.cli import group_items_by_table, save_json
+from hkjc_scraper.cli import group_items_by_table, parse_date_arg, save_json
 
 
 class TestGroupItemsByTable:
@@ -44,6 +44,26 @@ class TestGroupItemsByTable:
         }
 
 
+class TestParseDateArg:
+    """Tests for parse_date_arg function."""
+
+    def test_accepts_slash_format(self):
+        assert parse_date_arg("2026/03/01") == "2026/03/01"
+
+    def test_pads_unpadded_dates(self):
+        assert parse_date_arg("2015/1/1") == "2015/01/01"
+
+    @pytest.mark.parametrize("value", [
+        "2026/13/01", "2026/02/30", "01/03/2026", "latest",
+        "2026-03-01", "20150101", "2015-W01-1",
+    ])
+    def test_rejects_invalid_dates(self, value):
+        import argparse
+
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_date_arg(value)
+
+
 class TestSaveJson:
     """Tests for save_json function."""
 
@@ -89,6 +109,61 @@ class TestExportToDb:
         assert "Error" in captured.out
 
 
+class TestFlushToDb:
+    """Tests for _flush_to_db function."""
+
+    def test_commits_once_per_flush(self):
+        """Test all tables share one transaction and counts accumulate."""
+        from unittest.mock import patch
+        from hkjc_scraper.cli import _flush_to_db
+
+        conn = MagicMock()
+        importers = {
+            "races": MagicMock(return_value=2),
+            "performance": MagicMock(return_value=5),
+        }
+        accumulator = {"races": 1}
+        with patch("hkjc_scraper.cli.get_db_connection", return_value=conn), \
+             patch.dict("hkjc_scraper.database.TABLE_IMPORTERS", importers):
+            _flush_to_db(
+                {"races": [{}, {}], "performance": [{}] * 5},
+                accumulator=accumulator,
+            )
+
+        conn.commit.assert_called_once()
+        conn.close.assert_called_once()
+        assert accumulator == {"races": 3, "performance": 5}
+
+    def test_shared_connection_left_open(self):
+        """Test a caller-supplied connection is reused and not closed."""
+        from unittest.mock import patch
+        from hkjc_scraper.cli import _flush_to_db
+
+        conn = MagicMock()
+        with patch("hkjc_scraper.cli.get_db_connection") as mock_connect, \
+             patch.dict("hkjc_scraper.database.TABLE_IMPORTERS",
+                        {"races": MagicMock(return_value=1)}):
+            _flush_to_db({"races": [{}]}, conn=conn)
+
+        mock_connect.assert_not_called()
+        conn.commit.assert_called_once()
+        conn.close.assert_not_called()
+
+    def test_failed_flush_rolls_back(self):
+        """Test a failing importer rolls back so the connection stays usable."""
+        from unittest.mock import patch
+        from hkjc_scraper.cli import _flush_to_db
+
+        conn = MagicMock()
+        with patch.dict("hkjc_scraper.database.TABLE_IMPORTERS",
+                        {"races": MagicMock(side_effect=RuntimeError("boom"))}):
+            with pytest.raises(RuntimeError):
+                _flush_to_db({"races": [{}]}, conn=conn)
+
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+
+
 class TestCrawlRace:
     """Tests for crawl_race function."""
 
@@ -100,7 +175,7 @@ class TestCrawlRace:
         output_dir = tmp_path / "output"
 
         # Mock the spider
-        with patch("hkjc_scraper.cli.HKJCRacingSpider") as mock_spider_class:
+        with patch("hkjc_scraper.spider.HKJCRacingSpider") as mock_spider_class:
             mock_spider = AsyncMock()
             mock_spider.run = AsyncMock()
             mock_result = MagicMock()
@@ -131,7 +206,7 @@ class TestCrawlRace:
         output_dir = tmp_path / "output"
 
         # Mock the spider
-        with patch("hkjc_scraper.cli.HKJCRacingSpider") as mock_spider_class:
+        with patch("hkjc_scraper.spider.HKJCRacingSpider") as mock_spider_class:
             mock_spider = AsyncMock()
             mock_spider.run = AsyncMock()
             mock_result = MagicMock()
@@ -161,7 +236,7 @@ class TestCrawlRace:
         output_dir.mkdir()
 
         # Mock the spider and the export function
-        with patch("hkjc_scraper.cli.HKJCRacingSpider") as mock_spider_class, \
+        with patch("hkjc_scraper.spider.HKJCRacingSpider") as mock_spider_class, \
              patch("hkjc_scraper.cli.export_to_db") as mock_export:
             mock_spider = AsyncMock()
             mock_spider.run = AsyncMock()
@@ -195,7 +270,7 @@ class TestCrawlRace:
 
         output_dir = tmp_path / "output"
 
-        with patch("hkjc_scraper.cli.HKJCRacingSpider") as mock_spider_class, \
+        with patch("hkjc_scraper.spider.HKJCRacingSpider") as mock_spider_class, \
              patch("hkjc_scraper.cli.export_to_db"):
             mock_spider = AsyncMock()
             mock_result = MagicMock()
@@ -217,3 +292,79 @@ class TestCrawlRace:
 
         # No JSON files should be created
         assert not output_dir.exists() or not list(output_dir.glob("*.json"))
+
+
+class TestStartDateExport:
+    """Tests for the streaming --start-date --export-db path."""
+
+    @staticmethod
+    def _run_export(run, conn, **flush_kwargs):
+        """Run ``--start-date --export-db`` over two discovered dates.
+
+        Args:
+            run: Async callable taking the scraped date, used as spider.run
+            conn: Connection returned by the patched get_db_connection
+            **flush_kwargs: Extra arguments for the _flush_to_db patch
+
+        Returns:
+            The _flush_to_db mock
+        """
+        from unittest.mock import AsyncMock, patch
+        import asyncio
+
+        from hkjc_scraper.cli import async_main
+
+        def make_spider(dates=None, racecourse=None):
+            spider = MagicMock()
+            spider.discover_dates = AsyncMock(return_value=[
+                {"date": "2026/03/01", "racecourse": "ST", "race_count": 10},
+                {"date": "2026/03/04", "racecourse": "ST", "race_count": 9},
+            ])
+            spider.run = lambda: run(dates[0])
+            return spider
+
+        argv = ["hkjc-scraper", "--start-date", "2026/03/01", "--end-date",
+                "2026/03/04", "--export-db", "--database-url", "postgresql://x"]
+        with patch("sys.argv", argv), \
+             patch("hkjc_scraper.spider.HKJCRacingSpider", side_effect=make_spider), \
+             patch("hkjc_scraper.cli._setup_db"), \
+             patch("hkjc_scraper.cli.get_db_connection", return_value=conn), \
+             patch("hkjc_scraper.cli._flush_to_db", **flush_kwargs) as mock_flush:
+            asyncio.run(async_main())
+        return mock_flush
+
+    def test_flushes_every_date_and_closes_connection(self):
+        """Test each scraped date is flushed once on the shared connection."""
+
+        async def run(date):
+            result = MagicMock()
+            result.items = [{"table": "races", "data": {"race_id": date}}]
+            return result
+
+        conn = MagicMock()
+        mock_flush = self._run_export(run, conn)
+
+        flushed = [call.args[0]["races"][0]["race_id"] for call in mock_flush.call_args_list]
+        assert flushed == ["2026/03/01", "2026/03/04"]
+        assert all(call.kwargs["conn"] is conn for call in mock_flush.call_args_list)
+        conn.close.assert_called_once()
+
+    def test_reports_flush_error_when_scrape_also_fails(self, capsys):
+        """Test a failing in-flight flush is reported, not silently dropped."""
+        import asyncio
+
+        async def run(date):
+            if date == "2026/03/04":
+                # Let the first date's flush finish (and fail) first
+                await asyncio.sleep(0.05)
+                raise RuntimeError("scrape failed")
+            result = MagicMock()
+            result.items = []
+            return result
+
+        conn = MagicMock()
+        with pytest.raises(RuntimeError, match="scrape failed"):
+            self._run_export(run, conn, side_effect=ValueError("flush failed"))
+
+        assert "Database flush failed: flush failed" in capsys.readouterr().out
+        conn.close.assert_called_once()
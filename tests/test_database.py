@@ -365,6 +365,89 @@ class TestImportSectionalTimes:
         assert count == 1
 
 
+class TestUpdatePerformanceGear:
+    """Tests for update_performance_gear function."""
+
+    def test_updates_matching_rows(self, db_conn) -> None:
+        """Test gear is applied by (race_id, horse_id) in a batch."""
+        from hkjc_scraper.database import (
+            import_horses,
+            import_performance,
+            import_races,
+            update_performance_gear,
+        )
+
+        import_races([
+            {"race_id": f"2026-03-01-ST-{n}", "race_date": "2026/03/01",
+             "race_no": n, "racecourse": "沙田"}
+            for n in (1, 2)
+        ], db_conn)
+        import_horses([{"horse_id": "HK_2023_J001", "name": "測試馬"}], db_conn)
+        import_performance([
+            {"race_id": f"2026-03-01-ST-{n}", "horse_no": "1",
+             "horse_id": "HK_2023_J001", "position": "1", "horse_name": "測試馬"}
+            for n in (1, 2)
+        ], db_conn)
+        db_conn.commit()
+
+        count = update_performance_gear([
+            {"race_id": "2026-03-01-ST-1", "horse_id": "HK_2023_J001", "gear": "B"},
+            {"race_id": "2026-03-01-ST-2", "horse_id": "HK_2023_J001", "gear": "TT"},
+            {"race_id": "2026-03-01-ST-3", "horse_id": "HK_2023_J001", "gear": "V"},
+            {"race_id": "2026-03-01-ST-1", "horse_id": None, "gear": "B"},
+        ], db_conn, batch_size=2)
+        db_conn.commit()
+        assert count == 2
+
+        cursor = db_conn.cursor()
+        cursor.execute("SELECT race_id, gear FROM performance ORDER BY race_id")
+        assert cursor.fetchall() == [
+            ("2026-03-01-ST-1", "B"),
+            ("2026-03-01-ST-2", "TT"),
+        ]
+
+        # Re-applying identical gear leaves rows untouched
+        count = update_performance_gear([
+            {"race_id": "2026-03-01-ST-1", "horse_id": "HK_2023_J001", "gear": "B"},
+            {"race_id": "2026-03-01-ST-2", "horse_id": "HK_2023_J001", "gear": "B"},
+        ], db_conn)
+        assert count == 1
+
+    def test_duplicate_keys_apply_last_record(self, db_conn) -> None:
+        """Test repeated (race_id, horse_id) pairs resolve to the last gear."""
+        from hkjc_scraper.database import (
+            import_horses,
+            import_performance,
+            import_races,
+            update_performance_gear,
+        )
+
+        import_races([{"race_id": "2026-03-01-ST-1", "race_date": "2026/03/01",
+                       "race_no": 1, "racecourse": "沙田"}], db_conn)
+        import_horses([{"horse_id": "HK_2023_J001", "name": "測試馬"}], db_conn)
+        import_performance([{"race_id": "2026-03-01-ST-1", "horse_no": "1",
+                             "horse_id": "HK_2023_J001", "position": "1",
+                             "horse_name": "測試馬"}], db_conn)
+        db_conn.commit()
+
+        count = update_performance_gear([
+            {"race_id": "2026-03-01-ST-1", "horse_id": "HK_2023_J001", "gear": "B"},
+            {"race_id": "2026-03-01-ST-1", "horse_id": "HK_2023_J001", "gear": "TT"},
+        ], db_conn)
+        db_conn.commit()
+        assert count == 1
+
+        cursor = db_conn.cursor()
+        cursor.execute("SELECT gear FROM performance WHERE race_id = '2026-03-01-ST-1'")
+        assert cursor.fetchone() == ("TT",)
+
+    def test_empty_list(self, db_conn) -> None:
+        """Test updating with no records returns 0."""
+        from hkjc_scraper.database import update_performance_gear
+
+        assert update_performance_gear([], db_conn) == 0
+
+
 class TestExportJsonToDb:
     """Tests for export_json_to_db function."""
 
@@ -394,6 +477,41 @@ class TestExportJsonToDb:
         conn.commit()
         conn.close()
 
+    def test_export_merges_table_files(self, db_url) -> None:
+        """Test a table's files are imported together, newest record winning."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data_dir = Path(tmpdir)
+            files = {
+                "races_2026-03-01.json": [
+                    {"race_id": "2026-03-01-ST-1", "race_date": "2026/03/01",
+                     "race_no": 1, "racecourse": "沙田", "distance": 1200},
+                    {"race_id": "2026-03-01-ST-2", "race_date": "2026/03/01",
+                     "race_no": 2, "racecourse": "沙田", "distance": 1400},
+                ],
+                "races_2026-03-02.json": [
+                    {"race_id": "2026-03-01-ST-1", "race_date": "2026/03/01",
+                     "race_no": 1, "racecourse": "沙田", "distance": 1650},
+                ],
+            }
+            for name, records in files.items():
+                with open(data_dir / name, "w", encoding="utf-8") as f:
+                    json.dump(records, f)
+
+            from hkjc_scraper.database import export_json_to_db
+
+            counts = export_json_to_db(data_dir, db_url)
+            assert counts["races"] == 2
+
+        conn = __import__("psycopg2").connect(db_url)
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT distance FROM races WHERE race_id = '2026-03-01-ST-1'"
+        )
+        assert cursor.fetchone() == (1650,)
+        cursor.execute("DELETE FROM races")
+        conn.commit()
+        conn.close()
+
     def test_export_nonexistent_dir_raises_error(self, db_url) -> None:
         """Test export with non-existent directory raises error."""
         from hkjc_scraper.database import export_json_to_db
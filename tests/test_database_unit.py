@@ -0,0 +1,29 @@
+"""Tests for database helpers that do not need a PostgreSQL instance."""
+
+
+class TestGetDbConnection:
+    """Tests for get_db_connection function."""
+
+    def test_enables_keepalives(self) -> None:
+        """Test keepalives are added without overriding URL settings."""
+        from unittest.mock import patch
+        from hkjc_scraper.database import get_db_connection
+
+        url = "postgresql://u:p@localhost/db?keepalives_idle=60"
+        with patch("hkjc_scraper.database.psycopg2.connect") as mock_connect:
+            get_db_connection(url)
+
+        mock_connect.assert_called_once_with(
+            url, keepalives=1, keepalives_interval=10, keepalives_count=5,
+        )
+
+
+class TestCreateDatabase:
+    """Tests for create_database function."""
+
+    def test_schema_sql_read_once(self) -> None:
+        """Test the schema file is read once and reused."""
+        from hkjc_scraper.database import _load_schema_sql
+
+        assert "CREATE TABLE IF NOT EXISTS races" in _load_schema_sql()
+        assert _load_schema_sql() is _load_schema_sql()
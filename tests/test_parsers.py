@@ -158,3 +158,13 @@ class TestParseSectionalTimeCell:
         """Test parsing an empty cell returns None."""
         result = parse_sectional_time_cell("")
         assert result is None
+
+
+class TestPackageExports:
+    """Test the package-level public API."""
+
+    def test_all_names_resolve(self):
+        import hkjc_scraper
+
+        missing = [name for name in hkjc_scraper.__all__ if not hasattr(hkjc_scraper, name)]
+        assert missing == []
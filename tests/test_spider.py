@@ -23,6 +23,41 @@ class TestSpiderClass:
         spider = HKJCRacingSpider()
         assert spider.concurrent_requests == 15
 
+    @pytest.mark.asyncio
+    async def test_run_returns_crawl_result(self):
+        from unittest.mock import patch
+        from hkjc_scraper.spider import CrawlResult
+
+        async def fake_stream(self):
+            yield {"table": "races", "data": {"race_id": "R1"}}
+
+        with patch.object(HKJCRacingSpider, "stream", fake_stream), \
+             patch.object(HKJCRacingSpider, "stats", "stats"):
+            result = await HKJCRacingSpider().run()
+
+        assert result == CrawlResult([{"table": "races", "data": {"race_id": "R1"}}], "stats")
+
+
+class TestParseAllResults:
+    """Test race fan-out from a meeting's results page."""
+
+    @pytest.mark.asyncio
+    async def test_follows_race_card_links(self, sample_race_response):
+        spider = HKJCRacingSpider()
+        sample_race_response.meta = {"date": "2026/03/01", "racecourse": "ST"}
+        requests = [r async for r in spider.parse_all_results(sample_race_response)]
+        assert [r.meta["race_no"] for r in requests] == list(range(1, 12))
+
+    @pytest.mark.asyncio
+    async def test_skips_races_missing_from_race_card(self, sample_race_response):
+        spider = HKJCRacingSpider()
+        sample_race_response.html = sample_race_response.html.replace(
+            "RaceNo=10", "RaceNo=9",
+        ).replace("RaceNo=11", "RaceNo=9")
+        sample_race_response.meta = {"date": "2026/03/01", "racecourse": "ST"}
+        requests = [r async for r in spider.parse_all_results(sample_race_response)]
+        assert [r.meta["race_no"] for r in requests] == list(range(1, 10))
+
 
 class TestRaceMetadataParser:
     """Test race metadata extraction."""
@@ -894,3 +929,154 @@ class TestRateLimiting:
     - concurrent_requests_per_domain class attribute
     - download_delay class attribute
     """
+
+
+class TestDiscoverDates:
+    """Test module-level discover_dates cache handling."""
+
+    @pytest.fixture
+    def fetcher_session(self):
+        """Mock FetcherSession context manager and the session it yields."""
+        from unittest.mock import AsyncMock, MagicMock
+
+        session = MagicMock()
+        session.get = AsyncMock(return_value=None)
+        session_cm = MagicMock()
+        session_cm.__aenter__ = AsyncMock(return_value=session)
+        session_cm.__aexit__ = AsyncMock(return_value=False)
+        return session_cm, session
+
+    @pytest.mark.asyncio
+    async def test_cached_and_season_break_dates_skip_fetch(self, tmp_path, fetcher_session):
+        """Cached combinations and August dates never reach the network."""
+        from unittest.mock import patch
+        from hkjc_scraper.cache import DiscoveryCache
+        from hkjc_scraper.spider import discover_dates
+
+        cache_path = tmp_path / "cache.json"
+        cache = DiscoveryCache(str(cache_path))
+        cache.add_discovery("2025/07/31", "ST", 10)
+        cache.add_discovery("2025/07/31", "HV", 9)
+        cache.save()
+
+        session_cm, session = fetcher_session
+
+        with patch("hkjc_scraper.spider.FetcherSession", return_value=session_cm):
+            result = await discover_dates(
+                "2025/07/31", "2025/08/01", cache_path=str(cache_path),
+            )
+
+        session.get.assert_not_called()
+        assert sorted((r["date"], r["racecourse"]) for r in result) == [
+            ("2025/07/31", "HV"),
+            ("2025/07/31", "ST"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_failed_checks_do_not_abort_discovery(self, tmp_path, fetcher_session):
+        """A failing fetch is logged and the remaining dates still resolve."""
+        from unittest.mock import patch
+        from hkjc_scraper.spider import discover_dates
+
+        async def fake_check(session, date, racecourse, cache, cache_empty=False):
+            if date == "2025/07/01":
+                raise RuntimeError("boom")
+            return {"date": date, "racecourse": racecourse, "race_count": 9}
+
+        session_cm, _ = fetcher_session
+
+        with patch("hkjc_scraper.spider.FetcherSession", return_value=session_cm), \
+             patch("hkjc_scraper.spider._check_date_with_session", side_effect=fake_check):
+            result = await discover_dates(
+                "2025/07/01", "2025/07/03", racecourses=["ST"],
+                cache_path=str(tmp_path / "cache.json"),
+            )
+
+        assert [r["date"] for r in result] == ["2025/07/02", "2025/07/03"]
+        assert (tmp_path / "cache.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_past_empty_dates_cached_unless_refreshing(self, tmp_path, fetcher_session):
+        """Past dates with no races are not re-fetched, except on refresh."""
+        from unittest.mock import MagicMock, patch
+        from hkjc_scraper.spider import discover_dates
+
+        empty_page = MagicMock(status=200)
+        empty_page.get_all_text.return_value = "沒有賽事"
+        session_cm, session = fetcher_session
+        session.get.return_value = empty_page
+        cache_path = str(tmp_path / "cache.json")
+
+        with patch("hkjc_scraper.spider.FetcherSession", return_value=session_cm):
+            for _ in range(2):
+                await discover_dates(
+                    "2025/07/01", "2025/07/01", racecourses=["ST"],
+                    cache_path=cache_path,
+                )
+            assert session.get.await_count == 1
+
+            await discover_dates(
+                "2025/07/01", "2025/07/01", racecourses=["ST"],
+                cache_path=cache_path, refresh_cache=True,
+            )
+            assert session.get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_today_is_hong_kong_date(self, tmp_path, fetcher_session):
+        """A date that is today in Hong Kong is never cached as empty."""
+        from datetime import datetime as real_datetime
+        from unittest.mock import MagicMock, patch
+        from hkjc_scraper.cache import DiscoveryCache
+        from hkjc_scraper.spider import discover_dates
+
+        class FakeDatetime(real_datetime):
+            @classmethod
+            def now(cls, tz=None):
+                if tz is None:
+                    # Host clock is already on the next day
+                    return real_datetime(2025, 7, 2, 1, 0)
+                return real_datetime(2025, 7, 1, 23, 0, tzinfo=tz)
+
+        empty_page = MagicMock(status=200)
+        empty_page.get_all_text.return_value = "沒有賽事"
+        session_cm, session = fetcher_session
+        session.get.return_value = empty_page
+        cache_path = str(tmp_path / "cache.json")
+
+        with patch("hkjc_scraper.spider.FetcherSession", return_value=session_cm), \
+             patch("hkjc_scraper.spider.datetime", FakeDatetime):
+            await discover_dates(
+                "2025/07/01", "2025/07/01", racecourses=["ST"],
+                cache_path=cache_path,
+            )
+
+        cache = DiscoveryCache(cache_path)
+        cache.load()
+        assert cache.has_no_races("2025/07/01", "ST") is False
+
+    @pytest.mark.asyncio
+    async def test_pages_without_no_race_marker_are_not_cached(self, tmp_path, fetcher_session):
+        """A 200 page with no race links but no no-race text is re-checked."""
+        from unittest.mock import MagicMock, patch
+        from hkjc_scraper.cache import DiscoveryCache
+        from hkjc_scraper.spider import discover_dates
+
+        maintenance_page = MagicMock(status=200)
+        maintenance_page.get_all_text.return_value = "系統維護中"
+        maintenance_page.css.return_value = []
+        session_cm, session = fetcher_session
+        session.get.return_value = maintenance_page
+        cache_path = str(tmp_path / "cache.json")
+
+        with patch("hkjc_scraper.spider.FetcherSession", return_value=session_cm):
+            for _ in range(2):
+                result = await discover_dates(
+                    "2025/07/01", "2025/07/01", racecourses=["ST"],
+                    cache_path=cache_path,
+                )
+                assert result == []
+            assert session.get.await_count == 2
+
+        cache = DiscoveryCache(cache_path)
+        cache.load()
+        assert cache.has_no_races("2025/07/01", "ST") is False
@@ -1,5 +1,7 @@
 """Unit tests for the utils module."""
 
+import pytest
+
 from hkjc_scraper.utils import generate_date_range, parse_race_date
 
 
@@ -23,9 +25,25 @@ def test_generate_date_range_august_skipped():
     assert "2015/08/02" in dates
 
 
+def test_generate_date_range_end_before_start():
+    """Test an inverted range yields nothing."""
+    assert list(generate_date_range("2015/01/03", "2015/01/01")) == []
+
+
 def test_parse_race_date():
     """Test parsing race date string."""
     dt = parse_race_date("2015/01/01")
     assert dt.year == 2015
     assert dt.month == 1
     assert dt.day == 1
+
+
+def test_parse_race_date_matches_strptime_formats():
+    """Test unpadded dates parse and non-slash formats are rejected."""
+    assert parse_race_date("2015/1/1") == parse_race_date("2015/01/01")
+    for bad in (
+        "20150101", "2015-01-01", "2015/02/30", "15/1/1",
+        " 2015/ 1/ 1", "2015/+1/01", "2015/1_0/01",
+    ):
+        with pytest.raises(ValueError):
+            parse_race_date(bad)